@@ -1,79 +1,154 @@
+# -*- coding: latin-1 -*-
 from typing import Dict, Optional
+from dataclasses import dataclass
 import logging
+import logging.handlers
 import asyncio
-from decimal import Decimal
+import atexit
+import queue
+from decimal import Context, Decimal, setcontext
 import time
 from datetime import datetime
-from pathlib import Path
 import sys
 from .utils.binance import BinanceClient
 from .utils.ronin import RoninClient
 from .utils.telegram import TelegramNotifier
 import configparser
 
-# Logging Setup
+# 12 Stellen reichen fr USDT/AXS-Betrge (8 Nachkommastellen) und sparen
+# Rechenaufwand gegenber den standardmigen 28 Stellen
+setcontext(Context(prec=12))
+
+# Logging Setup: Datei- und Konsolenausgabe laufen in einem eigenen Thread,
+# damit Disk-I/O den Event Loop nicht blockiert
+_log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_log_handlers = [
+    logging.FileHandler('logs/bot.log'),
+    logging.StreamHandler(sys.stdout)
+]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_log_listener = logging.handlers.QueueListener(_log_queue, *_log_handlers)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+# Der QueueHandler bergibt nur die Nachricht, das Layout setzt der Listener
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('logs/bot.log'),
-        logging.StreamHandler(sys.stdout)
-    ]
+    format='%(message)s',
+    handlers=[logging.handlers.QueueHandler(_log_queue)]
 )
 logger = logging.getLogger(__name__)
 
+# Sekunden, in denen Telegram-Nachrichten zu einer Nachricht gebndelt werden
+TELEGRAM_DEBOUNCE = 1
+# Maximale Wartezeit beim Stoppen, bis ausstehende Nachrichten gesendet sind
+TELEGRAM_FLUSH_TIMEOUT = 10
+
+# Kaufbedingungen
+PRICE_DISCOUNT = 0.95  # Preis mind. 5% unter dem 24h-Durchschnitt
+RSI_OVERSOLD = 30.0    # RSI darunter gilt als berverkauft
+
+@dataclass(frozen=True, slots=True)
+class BotSettings:
+    """Einmalig aus der Konfiguration gelesene Bot-Einstellungen"""
+    usdt_amount: Decimal
+    check_interval: int
+    ronin_address: str
+
+    @classmethod
+    def from_config(cls, config: configparser.ConfigParser) -> 'BotSettings':
+        return cls(
+            usdt_amount=Decimal(config['BOT_SETTINGS']['usdt_amount']),
+            check_interval=config['BOT_SETTINGS'].getint('check_interval'),
+            ronin_address=config['RONIN']['wallet_address']
+        )
+
 class AXSStakingBot:
     def __init__(self, config_path: str = "config/config.ini"):
         """Initialisiert den AXS Staking Bot"""
         self.config = self._load_config(config_path)
-        self.binance = BinanceClient(
-            api_key=self.config['BINANCE']['api_key'],
-            api_secret=self.config['BINANCE']['api_secret']
-        )
-        self.ronin = RoninClient(
-            private_key=self.config['RONIN']['private_key'],
-            wallet_address=self.config['RONIN']['wallet_address']
-        )
+        self.settings = BotSettings.from_config(self.config)
+        # Die Clients werden in setup() asynchron aufgebaut
+        self.binance: Optional[BinanceClient] = None
+        self.ronin: Optional[RoninClient] = None
         self.telegram = TelegramNotifier(self.config) if self.config['TELEGRAM'].getboolean('enabled') else None
+        self.telegram_queue: asyncio.Queue = asyncio.Queue()
         self.running = False
+        self._stream_task: Optional[asyncio.Task] = None
+        self._telegram_task: Optional[asyncio.Task] = None
         
+    async def setup(self):
+        """Baut Binance- und Ronin-Client parallel auf"""
+        self.binance, self.ronin = await asyncio.gather(
+            BinanceClient.create(
+                api_key=self.config['BINANCE']['api_key'],
+                api_secret=self.config['BINANCE']['api_secret']
+            ),
+            RoninClient.create(
+                private_key=self.config['RONIN']['private_key'],
+                wallet_address=self.settings.ronin_address
+            )
+        )
+
     def _load_config(self, config_path: str) -> configparser.ConfigParser:
         """Ldt die Konfigurationsdatei"""
-        if not Path(config_path).exists():
-            raise FileNotFoundError(f"Config file not found: {config_path}")
-            
         config = configparser.ConfigParser()
-        config.read(config_path)
+        # read() ignoriert fehlende Dateien und liefert dann eine leere Liste
+        if not config.read(config_path):
+            raise FileNotFoundError(f"Config file not found: {config_path}")
         return config
 
+    def _notify(self, msg: str):
+        """Reiht eine Telegram-Nachricht ein, ohne auf den Versand zu warten"""
+        if self.telegram:
+            self.telegram_queue.put_nowait(msg)
+
+    async def _telegram_worker(self):
+        """Sendet eingereihte Telegram-Nachrichten im Hintergrund"""
+        while True:
+            messages = [await self.telegram_queue.get()]
+            # Kurz warten und gleichzeitig anfallende Nachrichten zusammenfassen
+            await asyncio.sleep(TELEGRAM_DEBOUNCE)
+            while not self.telegram_queue.empty():
+                messages.append(self.telegram_queue.get_nowait())
+            try:
+                await self.telegram.send_message("\n".join(messages))
+            except Exception as e:
+                logger.error("Fehler beim Senden der Telegram-Nachricht: %s", e)
+            finally:
+                for _ in messages:
+                    self.telegram_queue.task_done()
+
     async def check_price_conditions(self) -> bool:
         """berprft ob die Preisbedingungen fr einen Kauf erfllt sind"""
         try:
-            # Hole historische Daten
-            klines = await self.binance.get_klines('AXSUSDT', '1h', 24)
-            current_price = await self.binance.get_current_price('AXSUSDT')
+            # Hole historische Daten und aktuellen Preis parallel
+            klines, current_price = await asyncio.gather(
+                self.binance.get_klines('AXSUSDT', '1h', 24),
+                self.binance.get_current_price('AXSUSDT')
+            )
             
-            # Berechne Durchschnittspreis
-            prices = [float(k['close_price']) for k in klines]
-            avg_price = sum(prices) / len(prices)
+            closes = klines.close
+            if not len(closes):
+                return False
             
-            # RSI berechnen
-            rsi = await self.binance.calculate_rsi('AXSUSDT', 14)
+            # RSI aus den bereits geladenen Klines berechnen
+            rsi = await self.binance.calculate_rsi('AXSUSDT', 14, klines=klines)
             
             # Kaufbedingungen:
             # 1. Preis mind. 5% unter Durchschnitt
             # 2. RSI unter 30 (berverkauft)
-            price_condition = current_price < (avg_price * 0.95)
-            rsi_condition = rsi < 30
-            
-            if price_condition and rsi_condition:
-                logger.info(f"Kaufbedingungen erfllt - Preis: {current_price}, RSI: {rsi}")
+            if current_price < PRICE_DISCOUNT * closes.mean() and rsi < RSI_OVERSOLD:
+                logger.info("Kaufbedingungen erfllt - Preis: %s, RSI: %s", current_price, rsi)
                 return True
                 
             return False
             
         except Exception as e:
-            logger.error(f"Fehler bei der Preisanalyse: {e}")
+            logger.error("Fehler bei der Preisanalyse: %s", e)
             return False
 
     async def execute_buy(self, usdt_amount: Decimal) -> Optional[Dict]:
@@ -84,16 +159,14 @@ class AXSStakingBot:
             if order and order['status'] == 'FILLED':
                 msg = f"Kauf ausgefhrt: {order['executedQty']} AXS fr {usdt_amount} USDT"
                 logger.info(msg)
-                if self.telegram:
-                    await self.telegram.send_message(msg)
+                self._notify(msg)
                 return order
             
             return None
             
         except Exception as e:
-            logger.error(f"Fehler beim Kauf: {e}")
-            if self.telegram:
-                await self.telegram.send_message(f"Kaufversuch fehlgeschlagen: {e}")
+            logger.error("Fehler beim Kauf: %s", e)
+            self._notify(f"Kaufversuch fehlgeschlagen: {e}")
             return None
 
     async def transfer_to_ronin(self, amount: Decimal) -> Optional[str]:
@@ -101,22 +174,20 @@ class AXSStakingBot:
         try:
             withdrawal = await self.binance.withdraw_to_ronin(
                 amount=amount,
-                address=self.config['RONIN']['wallet_address']
+                address=self.settings.ronin_address
             )
             
             if withdrawal:
                 msg = f"Transfer zu Ronin initiiert: {amount} AXS"
                 logger.info(msg)
-                if self.telegram:
-                    await self.telegram.send_message(msg)
+                self._notify(msg)
                 return withdrawal['id']
             
             return None
             
         except Exception as e:
-            logger.error(f"Fehler beim Transfer: {e}")
-            if self.telegram:
-                await self.telegram.send_message(f"Transfer fehlgeschlagen: {e}")
+            logger.error("Fehler beim Transfer: %s", e)
+            self._notify(f"Transfer fehlgeschlagen: {e}")
             return None
 
     async def stake_axs(self, amount: Decimal) -> Optional[str]:
@@ -127,63 +198,97 @@ class AXSStakingBot:
             if tx_hash:
                 msg = f"Staking erfolgreich: {amount} AXS"
                 logger.info(msg)
-                if self.telegram:
-                    await self.telegram.send_message(msg)
+                self._notify(msg)
                 return tx_hash
             
             return None
             
         except Exception as e:
-            logger.error(f"Fehler beim Staking: {e}")
-            if self.telegram:
-                await self.telegram.send_message(f"Staking fehlgeschlagen: {e}")
+            logger.error("Fehler beim Staking: %s", e)
+            self._notify(f"Staking fehlgeschlagen: {e}")
             return None
 
     async def run(self):
         """Hauptloop des Bots"""
+        if self.binance is None or self.ronin is None:
+            await self.setup()
+        # Preis und Klines per Websocket aktuell halten statt bei jedem Check zu pollen
+        self._stream_task = asyncio.create_task(self.binance.stream_klines('AXSUSDT', '1h'))
         self.running = True
         logger.info("Bot gestartet")
         if self.telegram:
-            await self.telegram.send_message("Bot gestartet")
+            self._telegram_task = asyncio.create_task(self._telegram_worker())
+        self._notify("Bot gestartet")
         
         while self.running:
             try:
                 # Prfe Binance USDT Balance
                 usdt_balance = await self.binance.get_balance('USDT')
-                usdt_amount = Decimal(self.config['BOT_SETTINGS']['usdt_amount'])
+                usdt_amount = self.settings.usdt_amount
                 
                 if usdt_balance >= usdt_amount:
                     if await self.check_price_conditions():
                         # Kaufe AXS
                         if order := await self.execute_buy(usdt_amount):
-                            await asyncio.sleep(10)  # Warte bis Order abgewickelt
+                            amount = Decimal(order['executedQty'])
                             
+                            # Ohne verlsslichen Ausgangsstand lsst sich der Eingang
+                            # auf Ronin nicht erkennen - AXS bleibt dann auf Binance
+                            start_balance = await self.ronin.get_axs_balance()
+                            transfer_started = int(time.time() * 1000)
+                            if start_balance is None:
+                                msg = "Ronin-Kontostand nicht abrufbar, Transfer abgebrochen"
+                                logger.error(msg)
+                                self._notify(msg)
                             # Transfer zu Ronin
-                            if tx_hash := await self.transfer_to_ronin(Decimal(order['executedQty'])):
-                                await asyncio.sleep(900)  # Warte ~15min auf Transfer
-                                
-                                # Stake AXS
-                                await self.stake_axs(Decimal(order['executedQty']))
+                            elif withdrawal_id := await self.transfer_to_ronin(amount):
+                                # Warte bis der Transfer besttigt und auf Ronin angekommen ist.
+                                # Binance zieht die Netzwerkgebhr vom Betrag ab.
+                                if withdrawal := await self.binance.wait_for_withdrawal(withdrawal_id, transfer_started):
+                                    net_amount = amount - Decimal(withdrawal['transactionFee'])
+                                    if await self.ronin.wait_for_axs_deposit(net_amount, start_balance):
+                                        # Stake AXS
+                                        await self.stake_axs(net_amount)
                 
                 # Warte das konfigurierte Intervall
-                await asyncio.sleep(int(self.config['BOT_SETTINGS']['check_interval']))
+                await asyncio.sleep(self.settings.check_interval)
                 
             except Exception as e:
-                logger.error(f"Fehler im Hauptloop: {e}")
-                if self.telegram:
-                    await self.telegram.send_message(f"Fehler aufgetreten: {e}")
+                logger.error("Fehler im Hauptloop: %s", e)
+                self._notify(f"Fehler aufgetreten: {e}")
                 await asyncio.sleep(60)
 
     async def stop(self):
         """Stoppt den Bot"""
         self.running = False
+        if self._stream_task:
+            self._stream_task.cancel()
+            self._stream_task = None
+        if self.binance:
+            await self.binance.close()
         logger.info("Bot gestoppt")
-        if self.telegram:
-            await self.telegram.send_message("Bot gestoppt")
+        self._notify("Bot gestoppt")
 
-if __name__ == "__main__":
+        # Ausstehende Nachrichten noch senden, dann den Worker beenden
+        if self._telegram_task:
+            try:
+                await asyncio.wait_for(self.telegram_queue.join(), TELEGRAM_FLUSH_TIMEOUT)
+            except asyncio.TimeoutError:
+                logger.error("Nicht alle Telegram-Nachrichten konnten gesendet werden")
+            self._telegram_task.cancel()
+            self._telegram_task = None
+
+async def main():
     bot = AXSStakingBot()
     try:
-        asyncio.run(bot.run())
+        await bot.setup()
+        await bot.run()
+    finally:
+        # Im selben Event Loop stoppen, damit die HTTP-Session sauber geschlossen wird
+        await bot.stop()
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
     except KeyboardInterrupt:
-        asyncio.run(bot.stop())
\ No newline at end of file
+        pass
\ No newline at end of file
@@ -1,96 +1,400 @@
-from typing import Dict, List, Optional
-from decimal import Decimal
+from typing import Dict, Optional, Tuple
+from dataclasses import dataclass, fields
+from decimal import Decimal, ROUND_DOWN, localcontext
+import asyncio
 import logging
+import threading
+import time
+import aiohttp
 import numpy as np
-from binance.client import Client
-from binance.exceptions import BinanceAPIException
+import orjson
+from binance import AsyncClient, BinanceSocketManager
+from binance.exceptions import BinanceAPIException, BinanceRequestException
 
 logger = logging.getLogger(__name__)
 
+# Wie lange geladene Klines wiederverwendet werden (Sekunden)
+KLINE_CACHE_TTL = 30
+
+# Wie lange ein per Websocket empfangener Preis als aktuell gilt (Sekunden)
+PRICE_STREAM_TTL = 10
+
+# Withdrawal-Status laut Binance API
+WITHDRAW_COMPLETED = 6
+WITHDRAW_FAILED = (1, 3, 5)  # Abgebrochen, Abgelehnt, Fehlgeschlagen
+
+# Puffer für Uhrzeitabweichungen beim Abfragen der Withdrawal-Historie (ms)
+WITHDRAW_LOOKBACK_MS = 5 * 60 * 1000
+
+@dataclass
+class Klines:
+    """Kline/Candlestick-Daten als Spalten (ein Array pro Feld)"""
+    open_time: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    close_time: np.ndarray
+
+    @classmethod
+    def from_raw(cls, raw: list) -> 'Klines':
+        """Wandelt die Binance-Antwort in einem Durchgang in Spalten um"""
+        if not raw:
+            return cls.empty()
+        data = np.array([k[:7] for k in raw], dtype=np.float64)
+        return cls(
+            open_time=data[:, 0].astype(np.int64),
+            open=data[:, 1],
+            high=data[:, 2],
+            low=data[:, 3],
+            close=data[:, 4],
+            volume=data[:, 5],
+            close_time=data[:, 6].astype(np.int64)
+        )
+
+    @classmethod
+    def empty(cls) -> 'Klines':
+        times = np.empty(0, dtype=np.int64)
+        values = np.empty(0, dtype=np.float64)
+        return cls(times, values, values, values, values, values, times)
+
+    def with_candle(self, candle: Tuple) -> 'Klines':
+        """Aktualisiert die laufende Kerze oder hängt eine neue an
+
+        Die Anzahl der Kerzen bleibt gleich, bei einer neuen Kerze fällt
+        die älteste heraus.
+        """
+        # Laufende Kerze ersetzen, sonst älteste Kerze verwerfen
+        keep = slice(None, -1) if candle[0] == self.open_time[-1] else slice(1, None)
+        return Klines(*[
+            np.append(getattr(self, f.name)[keep], value)
+            for f, value in zip(fields(self), candle)
+        ])
+
+    def tail(self, n: int) -> 'Klines':
+        """Gibt die letzten n Kerzen zurück (ohne Kopie)"""
+        return Klines(
+            open_time=self.open_time[-n:],
+            open=self.open[-n:],
+            high=self.high[-n:],
+            low=self.low[-n:],
+            close=self.close[-n:],
+            volume=self.volume[-n:],
+            close_time=self.close_time[-n:]
+        )
+
+    def __len__(self) -> int:
+        return len(self.close)
+
+def _wilder_seed(closes: np.ndarray, period: int = 14) -> Tuple[float, float]:
+    """Berechnet die geglätteten Durchschnittsgewinne/-verluste nach Wilder
+
+    Startwert ist der einfache Durchschnitt der ersten `period` Änderungen,
+    alle weiteren Änderungen werden rekursiv eingerechnet.
+    """
+    # Preisänderungen berechnen und in Gewinne/Verluste trennen
+    changes = np.diff(closes)
+    gains = np.clip(changes[:period], 0, None)
+    losses = np.clip(-changes[:period], 0, None)
+    
+    # Startwerte: einfacher Durchschnitt
+    avg_gain = float(gains.mean())
+    avg_loss = float(losses.mean())
+
+    # Die Glättung ist rekursiv und bleibt daher eine Schleife
+    for change in changes[period:].tolist():
+        avg_gain, avg_loss = _wilder_step(avg_gain, avg_loss, change, period)
+
+    return avg_gain, avg_loss
+
+def _wilder_step(avg_gain: float, avg_loss: float, change: float,
+                 period: int = 14) -> Tuple[float, float]:
+    """Rechnet eine neue Preisänderung in die Wilder-Durchschnitte ein"""
+    avg_gain = (avg_gain * (period - 1) + max(change, 0.0)) / period
+    avg_loss = (avg_loss * (period - 1) + max(-change, 0.0)) / period
+    return avg_gain, avg_loss
+
+def _rsi_from_averages(avg_gain: float, avg_loss: float) -> float:
+    """Berechnet den RSI aus den Durchschnittsgewinnen/-verlusten"""
+    if avg_loss == 0:
+        return 100.0
+        
+    rs = avg_gain / avg_loss
+    return 100 - (100 / (1 + rs))
+
+class _OrjsonAsyncClient(AsyncClient):
+    """AsyncClient, der REST-Antworten mit orjson statt json parst"""
+
+    async def _handle_response(self, response: aiohttp.ClientResponse):
+        if not str(response.status).startswith('2'):
+            raise BinanceAPIException(response, response.status, await response.text())
+
+        # Leere Antworten wie in python-binance als leeres Dict behandeln
+        body = await response.read()
+        if not body:
+            return {}
+
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            txt = body.decode(response.get_encoding(), errors='replace')
+            raise BinanceRequestException(f'Invalid Response: {txt}')
+
 class BinanceClient:
+    # Prozessweit geteilte Instanz samt HTTP-Session und Connection Pool
+    _instance: Optional['BinanceClient'] = None
+    _instance_lock = threading.Lock()
+    _client: Optional[AsyncClient] = None
+    _connect_lock = asyncio.Lock()
+
     def __init__(self, api_key: str, api_secret: str):
         """Initialisiert den Binance Client"""
-        self.client = Client(api_key, api_secret)
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self._kline_cache: Dict[Tuple[str, str], Tuple[float, Klines]] = {}
+        self._rsi_state: Dict[str, Dict] = {}
+        self._price_cache: Dict[str, Tuple[float, float]] = {}
+        self._symbol_filters_cache: Dict[str, Dict[str, Dict]] = {}
+
+    @property
+    def client(self) -> Optional[AsyncClient]:
+        """Der gemeinsame async Client (None solange nicht verbunden)"""
+        return type(self)._client
+
+    @classmethod
+    def get_instance(cls, api_key: str, api_secret: str) -> 'BinanceClient':
+        """Gibt die gemeinsame Client-Instanz zurück und legt sie bei Bedarf an"""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls(api_key, api_secret)
+            elif (cls._instance.api_key, cls._instance.api_secret) != (api_key, api_secret):
+                raise ValueError("BinanceClient wurde bereits mit anderen API-Keys angelegt")
+            return cls._instance
+
+    @classmethod
+    async def create(cls, api_key: str, api_secret: str) -> 'BinanceClient':
+        """Gibt die gemeinsame Instanz mit verbundenem async Client zurück"""
+        self = cls.get_instance(api_key, api_secret)
+        await self.connect()
+        return self
+
+    async def connect(self):
+        """Baut den async Client mit einer gemeinsamen HTTP-Session auf"""
+        cls = type(self)
+        # Parallele Aufrufe dürfen nicht je eine eigene Session aufbauen
+        async with cls._connect_lock:
+            if cls._client is not None:
+                return
+            # Ein Connection Pool für alle Requests (Keep-Alive spart TCP/TLS-Handshakes).
+            # Die Session besitzt den Connector und schließt ihn mit.
+            connector = aiohttp.TCPConnector(limit=20, ttl_dns_cache=300, keepalive_timeout=75)
+            cls._client = await _OrjsonAsyncClient.create(
+                self.api_key,
+                self.api_secret,
+                session_params={'connector': connector}
+            )
+
+    async def close(self):
+        """Schließt die gemeinsame HTTP-Session"""
+        cls = type(self)
+        if cls._client is not None:
+            await cls._client.close_connection()
+            cls._client = None
 
     async def get_balance(self, asset: str) -> Decimal:
         """Holt den Kontostand für ein Asset"""
         try:
-            balance = self.client.get_asset_balance(asset=asset)
+            balance = await self.client.get_asset_balance(asset=asset)
             return Decimal(balance['free'])
         except BinanceAPIException as e:
-            logger.error(f"Fehler beim Abrufen des {asset} Kontostands: {e}")
+            logger.error("Fehler beim Abrufen des %s Kontostands: %s", asset, e)
             return Decimal('0')
 
-    async def get_klines(self, symbol: str, interval: str, limit: int) -> List[Dict]:
+    async def get_klines(self, symbol: str, interval: str, limit: int) -> Klines:
         """Holt Kline/Candlestick-Daten"""
+        # Frische Daten aus dem Cache wiederverwenden
+        cached = self._kline_cache.get((symbol, interval))
+        if cached is not None:
+            ts, cached_klines = cached
+            if time.time() - ts < KLINE_CACHE_TTL and len(cached_klines) >= limit:
+                return cached_klines.tail(limit)
+
         try:
-            klines = self.client.get_klines(
+            klines = await self.client.get_klines(
                 symbol=symbol,
                 interval=interval,
                 limit=limit
             )
             
             # Formatiere Kline-Daten
-            formatted_klines = []
-            for k in klines:
-                formatted_klines.append({
-                    'open_time': k[0],
-                    'open_price': float(k[1]),
-                    'high_price': float(k[2]),
-                    'low_price': float(k[3]),
-                    'close_price': float(k[4]),
-                    'volume': float(k[5]),
-                    'close_time': k[6]
-                })
+            formatted_klines = Klines.from_raw(klines)
                 
+            self._kline_cache[(symbol, interval)] = (time.time(), formatted_klines)
             return formatted_klines
             
         except BinanceAPIException as e:
-            logger.error(f"Fehler beim Abrufen der Kline-Daten: {e}")
-            return []
+            logger.error("Fehler beim Abrufen der Kline-Daten: %s", e)
+            return Klines.empty()
 
     async def get_current_price(self, symbol: str) -> float:
         """Holt den aktuellen Preis eines Symbols"""
+        # Preis aus dem Websocket-Stream verwenden, solange er aktuell ist
+        cached = self._price_cache.get(symbol)
+        if cached is not None and time.time() - cached[0] < PRICE_STREAM_TTL:
+            return cached[1]
+
         try:
-            ticker = self.client.get_symbol_ticker(symbol=symbol)
+            ticker = await self.client.get_symbol_ticker(symbol=symbol)
             return float(ticker['price'])
         except BinanceAPIException as e:
-            logger.error(f"Fehler beim Abrufen des aktuellen Preises: {e}")
+            logger.error("Fehler beim Abrufen des aktuellen Preises: %s", e)
             return 0.0
 
-    async def calculate_rsi(self, symbol: str, period: int = 14) -> float:
-        """Berechnet den RSI (Relative Strength Index)"""
+    async def stream_klines(self, symbol: str, interval: str):
+        """Hält Kline-Cache und Preis über den Websocket-Stream aktuell
+
+        Läuft bis zum Abbruch und verbindet sich nach Fehlern neu. Fällt der
+        Stream aus, laufen die Caches ab und es wird wieder per REST geladen.
+        """
+        bsm = BinanceSocketManager(self.client)
+        while True:
+            try:
+                async with bsm.kline_socket(symbol, interval=interval) as stream:
+                    while True:
+                        msg = await stream.recv()
+                        self._apply_kline_update(symbol, interval, msg)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Fehler im Kline-Stream: %s", e)
+                await asyncio.sleep(5)
+
+    def _apply_kline_update(self, symbol: str, interval: str, msg: Dict):
+        """Übernimmt eine Kline-Nachricht in Preis- und Kline-Cache
+
+        Fehlermeldungen des Sockets werden als ConnectionError weitergereicht,
+        damit stream_klines eine neue Verbindung aufbaut.
+        """
+        if msg and msg.get('e') == 'error':
+            raise ConnectionError(f"Websocket-Fehler: {msg.get('m')}")
+
+        k = msg.get('k') if msg else None
+        if not k:
+            return
+
+        now = time.time()
+        self._price_cache[symbol] = (now, float(k['c']))
+
+        # Historie kommt per REST, der Stream hält sie nur aktuell
+        cached = self._kline_cache.get((symbol, interval))
+        if cached is None or not len(cached[1]):
+            return
+        ts, klines = cached
+        last_open = int(klines.open_time[-1])
+        if k['t'] < last_open:
+            return
+
+        # Nur die laufende Kerze aktualisieren oder um genau eine Kerze
+        # weiterrollen. Ist der Cache abgelaufen oder fehlen Kerzen, wird er
+        # verworfen und beim nächsten Zugriff per REST neu geladen.
+        bar_ms = int(klines.close_time[-1]) - last_open + 1
+        if now - ts >= KLINE_CACHE_TTL or k['t'] not in (last_open, last_open + bar_ms):
+            self._kline_cache.pop((symbol, interval), None)
+            return
+
+        candle = (k['t'], float(k['o']), float(k['h']), float(k['l']),
+                  float(k['c']), float(k['v']), k['T'])
+        self._kline_cache[(symbol, interval)] = (now, klines.with_candle(candle))
+
+    async def calculate_rsi(self, symbol: str, period: int = 14,
+                            klines: Optional[Klines] = None) -> float:
+        """Berechnet den RSI (Relative Strength Index) nach Wilder
+
+        Die geglätteten Durchschnitte werden pro Symbol gespeichert und nur
+        um neu abgeschlossene Kerzen fortgeschrieben. Die laufende Kerze
+        fließt vorläufig ein, ohne den Zustand zu verändern. Bereits geladene
+        Klines können übergeben werden, um einen zweiten Request zu vermeiden.
+        """
         try:
-            klines = await self.get_klines(symbol, '1h', period + 1)
-            if not klines:
+            state = self._rsi_state.get(symbol)
+            if state is not None and state['period'] != period:
+                state = None
+
+            if klines is None:
+                # Mit vorhandenem Zustand reichen die letzten zwei Kerzen
+                klines = await self.get_klines(symbol, '1h', 2 if state else period + 2)
+            if len(klines) < 2:
                 return 0.0
-                
-            # Preisänderungen berechnen
-            changes = []
-            for i in range(1, len(klines)):
-                change = klines[i]['close_price'] - klines[i-1]['close_price']
-                changes.append(change)
-                
-            # Positive und negative Änderungen trennen
-            gains = [change if change > 0 else 0 for change in changes]
-            losses = [-change if change < 0 else 0 for change in changes]
-            
-            # Durchschnitte berechnen
-            avg_gain = np.mean(gains)
-            avg_loss = np.mean(losses)
-            
-            if avg_loss == 0:
-                return 100.0
-                
-            rs = avg_gain / avg_loss
-            rsi = 100 - (100 / (1 + rs))
-            
-            return rsi
+
+            last_open_time = int(klines.open_time[-2])
+            last_close = float(klines.close[-2])
+
+            # Neu abgeschlossene Kerze in den Zustand übernehmen
+            if state is not None and last_open_time != state['open_time']:
+                bar_ms = int(klines.open_time[-1]) - last_open_time
+                if last_open_time - state['open_time'] == bar_ms:
+                    avg_gain, avg_loss = _wilder_step(
+                        state['avg_gain'],
+                        state['avg_loss'],
+                        last_close - state['last_close'],
+                        period
+                    )
+                    state = {
+                        'period': period,
+                        'avg_gain': avg_gain,
+                        'avg_loss': avg_loss,
+                        'last_close': last_close,
+                        'open_time': last_open_time
+                    }
+                else:
+                    # Kerzen verpasst - neu initialisieren
+                    state = None
+
+            if state is None:
+                if len(klines) < period + 2:
+                    klines = await self.get_klines(symbol, '1h', period + 2)
+                    if len(klines) < period + 2:
+                        return 0.0
+                    last_open_time = int(klines.open_time[-2])
+                    last_close = float(klines.close[-2])
+
+                avg_gain, avg_loss = _wilder_seed(klines.close[:-1], period)
+                state = {
+                    'period': period,
+                    'avg_gain': avg_gain,
+                    'avg_loss': avg_loss,
+                    'last_close': last_close,
+                    'open_time': last_open_time
+                }
+
+            self._rsi_state[symbol] = state
+
+            avg_gain, avg_loss = _wilder_step(
+                state['avg_gain'],
+                state['avg_loss'],
+                float(klines.close[-1]) - state['last_close'],
+                period
+            )
+            return _rsi_from_averages(avg_gain, avg_loss)
             
         except Exception as e:
-            logger.error(f"Fehler bei der RSI-Berechnung: {e}")
+            logger.error("Fehler bei der RSI-Berechnung: %s", e)
             return 0.0
 
+    async def _get_symbol_filters(self, symbol: str) -> Dict[str, Dict]:
+        """Holt die Filter eines Symbols, indiziert nach filterType
+
+        Die Filter ändern sich nur bei Exchange-Updates und werden daher
+        einmal pro Prozess geladen.
+        """
+        filters = self._symbol_filters_cache.get(symbol)
+        if filters is None:
+            info = await self.client.get_symbol_info(symbol)
+            filters = {f['filterType']: f for f in info['filters']}
+            self._symbol_filters_cache[symbol] = filters
+        return filters
+
     async def place_market_buy(self, symbol: str, usdt_amount: Decimal) -> Optional[Dict]:
         """Platziert eine Market Buy Order"""
         try:
@@ -99,37 +403,74 @@ class BinanceClient:
             if not price:
                 return None
                 
-            # Berechne Kaufmenge
-            quantity = float(usdt_amount) / price
-            
-            # Runde auf die richtige Dezimalstelle
-            info = self.client.get_symbol_info(symbol)
-            lot_size = next(f for f in info['filters'] if f['filterType'] == 'LOT_SIZE')
-            step_size = Decimal(lot_size['stepSize'])
-            quantity = float(Decimal(str(quantity)).quantize(step_size))
+            # Berechne Kaufmenge, abgerundet auf die erlaubte Schrittweite.
+            # stepSize kommt mit Nullen aufgefüllt ('0.01000000'), daher normalisieren.
+            filters = await self._get_symbol_filters(symbol)
+            step_size = Decimal(filters['LOT_SIZE']['stepSize'])
+            # Auch die Division abrunden: bei begrenzter Kontext-Genauigkeit
+            # könnte sie sonst auf die nächste Schrittweite aufrunden
+            with localcontext() as ctx:
+                ctx.rounding = ROUND_DOWN
+                quantity = (usdt_amount / Decimal(str(price))).quantize(step_size.normalize())
             
-            # Platziere Order
-            order = self.client.order_market_buy(
+            # Platziere Order (Menge als String, ohne Umweg über float)
+            order = await self.client.order_market_buy(
                 symbol=symbol,
-                quantity=quantity
+                quantity=format(quantity, 'f')
             )
             
+            # Nach einem Kauf keine veralteten Marktdaten verwenden
+            self._kline_cache.clear()
             return order
             
         except BinanceAPIException as e:
-            logger.error(f"Fehler beim Platzieren der Kauforder: {e}")
+            logger.error("Fehler beim Platzieren der Kauforder: %s", e)
             return None
 
     async def withdraw_to_ronin(self, amount: Decimal, address: str) -> Optional[Dict]:
         """Führt einen Withdrawal zu Ronin durch"""
         try:
-            withdrawal = self.client.withdraw(
+            withdrawal = await self.client.withdraw(
                 asset='AXS',
                 address=address,
-                amount=float(amount),
+                amount=format(amount, 'f'),
                 network='Ronin'
             )
             return withdrawal
         except BinanceAPIException as e:
-            logger.error(f"Fehler beim Withdrawal: {e}")
-            return None
\ No newline at end of file
+            logger.error("Fehler beim Withdrawal: %s", e)
+            return None
+
+    async def wait_for_withdrawal(self, withdrawal_id: str, start_time: int,
+                                  timeout: int = 1800) -> Optional[Dict]:
+        """Wartet bis ein Withdrawal abgeschlossen ist
+
+        Fragt den Status mit exponentiell wachsendem Abstand (max. 30s) ab und
+        lädt dabei nur die Historie ab start_time (ms, kurz vor dem
+        Withdrawal). Taucht der Withdrawal noch nicht auf, gilt er als
+        ausstehend. Gibt den abgeschlossenen Withdrawal-Eintrag zurück (inkl.
+        transactionFee) oder None, wenn der Withdrawal fehlschlägt oder das
+        Timeout erreicht wird.
+        """
+        deadline = time.monotonic() + timeout
+        attempt = 0
+        while time.monotonic() < deadline:
+            try:
+                history = await self.client.get_withdraw_history(
+                    startTime=start_time - WITHDRAW_LOOKBACK_MS
+                )
+                withdrawal = next((w for w in history if w.get('id') == withdrawal_id), None)
+                status = withdrawal.get('status') if withdrawal else None
+                if status == WITHDRAW_COMPLETED:
+                    return withdrawal
+                if status in WITHDRAW_FAILED:
+                    logger.error("Withdrawal %s fehlgeschlagen (Status %s)", withdrawal_id, status)
+                    return None
+            except Exception as e:
+                logger.error("Fehler beim Abrufen des Withdrawal-Status: %s", e)
+
+            await asyncio.sleep(min(30, 2 ** attempt))
+            attempt += 1
+
+        logger.error("Timeout beim Warten auf Withdrawal %s", withdrawal_id)
+        return None
\ No newline at end of file
@@ -1,6 +1,10 @@
 from typing import Optional
-from decimal import Decimal
+from decimal import Context, Decimal
+import asyncio
+import functools
+import json
 import logging
+import time
 from web3 import Web3
 from eth_account import Account
 from eth_account.signers.local import LocalAccount
@@ -10,6 +14,17 @@ logger = logging.getLogger(__name__)
 # AXS Contract Addresses
 AXS_CONTRACT = "0x97a9107C1793BC407d6F527b77e7fff4D812bece"
 STAKING_CONTRACT = "0x05b0bb3c1c320b280501b86706c3551995bc8571"
+AXS_DECIMALS = 18
+
+# On-Chain-Beträge haben 18 Nachkommastellen und werden unabhängig vom
+# globalen Decimal-Kontext exakt umgerechnet und verglichen
+WEI_CONTEXT = Context(prec=40)
+
+@functools.lru_cache(maxsize=8)
+def _load_abi_cached(filename: str) -> list:
+    """Lädt und parst eine ABI einmal pro Prozess"""
+    with open(f"config/abi/{filename}", 'r') as f:
+        return json.load(f)
 
 class RoninClient:
     def __init__(self, private_key: str, wallet_address: str):
@@ -28,16 +43,46 @@ class RoninClient:
             abi=self._load_abi('staking_contract_abi.json')
         )
 
-    def _load_abi(self, filename: str) -> str:
+    @classmethod
+    async def create(cls, private_key: str, wallet_address: str) -> 'RoninClient':
+        """Baut den Client in einem Thread auf (ABI-Dateien, Key-Ableitung)"""
+        return await asyncio.to_thread(cls, private_key, wallet_address)
+
+    def _load_abi(self, filename: str) -> list:
         """Lädt eine ABI aus einer JSON-Datei"""
         try:
-            with open(f"config/abi/{filename}", 'r') as f:
-                return f.read()
+            return _load_abi_cached(filename)
         except Exception as e:
-            logger.error(f"Fehler beim Laden der ABI {filename}: {e}")
+            logger.error("Fehler beim Laden der ABI %s: %s", filename, e)
             raise
 
-    async def get_axs_balance(self) -> Decimal:
-        """Holt den AXS-Kontostand der Wallet"""
+    async def get_axs_balance(self) -> Optional[Decimal]:
+        """Holt den AXS-Kontostand der Wallet (None bei RPC-Fehlern)"""
         try:
-            balance = self.axs_contract.functions.balance
\ No newline at end of file
+            # web3 arbeitet synchron, der RPC-Call läuft daher in einem Thread
+            balance = await asyncio.to_thread(
+                self.axs_contract.functions.balanceOf(self.wallet_address).call
+            )
+            return Decimal(balance).scaleb(-AXS_DECIMALS, WEI_CONTEXT)
+        except Exception as e:
+            logger.error("Fehler beim Abrufen des AXS-Kontostands: %s", e)
+            return None
+
+    async def wait_for_axs_deposit(self, expected_amount: Decimal, start_balance: Decimal,
+                                   timeout: int = 1800) -> bool:
+        """Wartet bis der AXS-Kontostand um mindestens expected_amount gestiegen ist
+
+        Fragt den Kontostand mit exponentiell wachsendem Abstand (max. 30s) ab.
+        """
+        deadline = time.monotonic() + timeout
+        attempt = 0
+        while time.monotonic() < deadline:
+            balance = await self.get_axs_balance()
+            if balance is not None and WEI_CONTEXT.subtract(balance, start_balance) >= expected_amount:
+                return True
+
+            await asyncio.sleep(min(30, 2 ** attempt))
+            attempt += 1
+
+        logger.error("Timeout beim Warten auf %s AXS in der Ronin Wallet", expected_amount)
+        return False
\ No newline at end of file
@@ -0,0 +1,101 @@
+import asyncio
+
+import pytest
+
+from src.utils import binance as binance_module
+from src.utils.binance import BinanceClient
+
+
+@pytest.fixture
+def fresh_client_class(monkeypatch):
+    monkeypatch.setattr(BinanceClient, '_instance', None)
+    monkeypatch.setattr(BinanceClient, '_client', None)
+    monkeypatch.setattr(BinanceClient, '_connect_lock', asyncio.Lock())
+    monkeypatch.setattr(binance_module.aiohttp, 'TCPConnector', lambda **kwargs: object())
+
+
+def test_concurrent_connect_creates_one_client(fresh_client_class, monkeypatch):
+    created = []
+
+    async def fake_create(*args, **kwargs):
+        await asyncio.sleep(0)
+        created.append(object())
+        return created[-1]
+
+    monkeypatch.setattr(binance_module._OrjsonAsyncClient, 'create', fake_create)
+
+    async def connect_twice():
+        return await asyncio.gather(
+            BinanceClient.create('key', 'secret'),
+            BinanceClient.create('key', 'secret')
+        )
+
+    first, second = asyncio.run(connect_twice())
+
+    assert first is second
+    assert len(created) == 1
+    assert first.client is created[0]
+
+
+def test_get_instance_rejects_other_keys(fresh_client_class):
+    BinanceClient.get_instance('key', 'secret')
+
+    with pytest.raises(ValueError):
+        BinanceClient.get_instance('other', 'secret')
+
+
+def test_wait_for_withdrawal_treats_missing_id_as_pending(fresh_client_class, monkeypatch, caplog):
+    responses = [[], [{'id': 'w1', 'status': 4}], [{'id': 'w1', 'status': 6, 'transactionFee': '0.1'}]]
+    calls = []
+
+    class FakeClient:
+        async def get_withdraw_history(self, **params):
+            calls.append(params)
+            return responses[len(calls) - 1]
+
+    async def no_sleep(_):
+        pass
+
+    monkeypatch.setattr(BinanceClient, '_client', FakeClient())
+    monkeypatch.setattr(binance_module.asyncio, 'sleep', no_sleep)
+    client = BinanceClient('key', 'secret')
+
+    withdrawal = asyncio.run(client.wait_for_withdrawal('w1', start_time=10_000_000))
+
+    assert withdrawal['transactionFee'] == '0.1'
+    assert len(calls) == 3
+    assert all(c['startTime'] == 10_000_000 - binance_module.WITHDRAW_LOOKBACK_MS for c in calls)
+    assert not [r for r in caplog.records if r.levelname == 'ERROR']
+
+
+class FakeResponse:
+    def __init__(self, status, body):
+        self.status = status
+        self.body = body
+
+    async def read(self):
+        return self.body
+
+    async def text(self):
+        return self.body.decode()
+
+    def get_encoding(self):
+        return 'utf-8'
+
+
+@pytest.mark.parametrize('body, expected', [
+    (b'', {}),
+    (b'{"price": "7.1"}', {'price': '7.1'}),
+    (b'[[1, "2.0"]]', [[1, '2.0']]),
+])
+def test_handle_response_parses_body(body, expected):
+    client = binance_module._OrjsonAsyncClient.__new__(binance_module._OrjsonAsyncClient)
+
+    assert asyncio.run(client._handle_response(FakeResponse(200, body))) == expected
+
+
+def test_handle_response_rejects_invalid_body():
+    client = binance_module._OrjsonAsyncClient.__new__(binance_module._OrjsonAsyncClient)
+
+    with pytest.raises(binance_module.BinanceRequestException, match='Invalid Response: <html>'):
+        asyncio.run(client._handle_response(FakeResponse(200, b'<html>')))
@@ -0,0 +1,54 @@
+import asyncio
+from decimal import Context, Decimal, localcontext
+
+import pytest
+
+from src.utils.binance import BinanceClient
+
+
+class StubClient:
+    def __init__(self, price, step_size):
+        self.price = price
+        self.step_size = step_size
+        self.orders = []
+
+    async def get_symbol_ticker(self, symbol):
+        return {'symbol': symbol, 'price': self.price}
+
+    async def get_symbol_info(self, symbol):
+        return {'filters': [
+            {'filterType': 'PRICE_FILTER', 'tickSize': '0.00100000'},
+            {'filterType': 'LOT_SIZE', 'stepSize': self.step_size},
+        ]}
+
+    async def order_market_buy(self, symbol, quantity):
+        self.orders.append(quantity)
+        return {'status': 'FILLED', 'executedQty': quantity}
+
+
+def _buy(monkeypatch, price, step_size, usdt_amount='100'):
+    stub = StubClient(price, step_size)
+    monkeypatch.setattr(BinanceClient, '_client', stub)
+    client = BinanceClient('key', 'secret')
+    # Gleicher Decimal-Kontext wie im Bot
+    with localcontext(Context(prec=12)):
+        asyncio.run(client.place_market_buy('AXSUSDT', Decimal(usdt_amount)))
+    return stub.orders
+
+
+def test_quantity_is_rounded_down_under_limited_precision(monkeypatch):
+    orders = _buy(monkeypatch, '7.1275837491090522', '0.01000000')
+
+    assert orders == ['14.02']
+    assert Decimal(orders[0]) * Decimal('7.1275837491090522') <= 100
+
+
+@pytest.mark.parametrize('step_size, expected', [
+    ('0.01000000', '14.03'),
+    ('0.10000000', '14.0'),
+    ('1.00000000', '14'),
+])
+def test_quantity_uses_zero_padded_step_size(monkeypatch, step_size, expected):
+    orders = _buy(monkeypatch, '7.123', step_size)
+
+    assert orders == [expected]
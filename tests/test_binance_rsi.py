@@ -0,0 +1,100 @@
+import asyncio
+import random
+
+import pytest
+
+from src.utils.binance import BinanceClient, Klines
+
+HOUR_MS = 3600 * 1000
+SYMBOL = 'AXSUSDT'
+
+
+def _closes(n=40, seed=1):
+    rng = random.Random(seed)
+    return [10.0 + rng.uniform(-1.0, 1.0) for _ in range(n)]
+
+
+def _klines(closes, start=0):
+    return Klines.from_raw([
+        [(start + i) * HOUR_MS, '1.0', '2.0', '0.5', str(close), '10.0', (start + i + 1) * HOUR_MS - 1]
+        for i, close in enumerate(closes)
+    ])
+
+
+def _reference_rsi(closes, period=14):
+    """Wilder-RSI über alle Kurse: SMA als Startwert, danach rekursiv"""
+    changes = [b - a for a, b in zip(closes, closes[1:])]
+    gains = [max(c, 0.0) for c in changes]
+    losses = [max(-c, 0.0) for c in changes]
+    avg_gain = sum(gains[:period]) / period
+    avg_loss = sum(losses[:period]) / period
+    for gain, loss in zip(gains[period:], losses[period:]):
+        avg_gain = (avg_gain * (period - 1) + gain) / period
+        avg_loss = (avg_loss * (period - 1) + loss) / period
+    if avg_loss == 0:
+        return 100.0
+    return 100 - 100 / (1 + avg_gain / avg_loss)
+
+
+def _rsi(client, closes, start, period=14):
+    return asyncio.run(client.calculate_rsi(SYMBOL, period, klines=_klines(closes, start)))
+
+
+@pytest.fixture
+def client():
+    return BinanceClient('key', 'secret')
+
+
+def test_first_call_seeds_from_window(client):
+    closes = _closes()
+
+    rsi = _rsi(client, closes[:24], 0)
+
+    assert rsi == pytest.approx(_reference_rsi(closes[:24]))
+    state = client._rsi_state[SYMBOL]
+    assert state['open_time'] == 22 * HOUR_MS
+    assert state['last_close'] == pytest.approx(closes[22])
+
+
+def test_single_bar_rolls_state_forward(client):
+    closes = _closes()
+    _rsi(client, closes[:24], 0)
+
+    rsi = _rsi(client, closes[1:25], 1)
+
+    # Fortschreiben entspricht der Rekursion über die gesamte Historie
+    assert rsi == pytest.approx(_reference_rsi(closes[:25]))
+    assert client._rsi_state[SYMBOL]['open_time'] == 23 * HOUR_MS
+
+
+def test_gap_forces_reseed(client):
+    closes = _closes()
+    _rsi(client, closes[:24], 0)
+
+    rsi = _rsi(client, closes[3:27], 3)
+
+    assert rsi == pytest.approx(_reference_rsi(closes[3:27]))
+    assert rsi != pytest.approx(_reference_rsi(closes[:27]))
+    assert client._rsi_state[SYMBOL]['open_time'] == 25 * HOUR_MS
+
+
+def test_period_change_forces_reseed(client):
+    closes = _closes()
+    _rsi(client, closes[:24], 0)
+
+    rsi = _rsi(client, closes[:24], 0, period=10)
+
+    assert rsi == pytest.approx(_reference_rsi(closes[:24], period=10))
+    assert client._rsi_state[SYMBOL]['period'] == 10
+
+
+def test_running_candle_does_not_change_state(client):
+    closes = _closes()
+    _rsi(client, closes[:24], 0)
+    state = dict(client._rsi_state[SYMBOL])
+
+    first = _rsi(client, closes[:23] + [closes[23] + 0.5], 0)
+    second = _rsi(client, closes[:23] + [closes[23] - 0.5], 0)
+
+    assert first != pytest.approx(second)
+    assert client._rsi_state[SYMBOL] == state
@@ -0,0 +1,96 @@
+import time
+
+import pytest
+
+from src.utils.binance import BinanceClient, Klines, KLINE_CACHE_TTL
+
+HOUR_MS = 3600 * 1000
+KEY = ('AXSUSDT', '1h')
+
+
+def _raw(open_time, close):
+    return [open_time, '1.0', '2.0', '0.5', str(close), '10.0', open_time + HOUR_MS - 1]
+
+
+def _klines(n=3, start=0):
+    return Klines.from_raw([_raw(start + i * HOUR_MS, 10.0 + i) for i in range(n)])
+
+
+def _msg(open_time, close):
+    return {
+        'e': 'kline',
+        's': 'AXSUSDT',
+        'k': {
+            't': open_time, 'T': open_time + HOUR_MS - 1,
+            'o': '1.0', 'h': '2.0', 'l': '0.5', 'c': str(close), 'v': '10.0'
+        }
+    }
+
+
+@pytest.fixture
+def client():
+    client = BinanceClient('key', 'secret')
+    client._kline_cache[KEY] = (time.time(), _klines())
+    return client
+
+
+def test_with_candle_replaces_running_candle():
+    klines = _klines()
+    updated = klines.with_candle((2 * HOUR_MS, 1.0, 2.0, 0.5, 99.0, 10.0, 3 * HOUR_MS - 1))
+
+    assert len(updated) == 3
+    assert list(updated.open_time) == list(klines.open_time)
+    assert list(updated.close) == [10.0, 11.0, 99.0]
+
+
+def test_with_candle_rolls_to_next_candle():
+    klines = _klines()
+    updated = klines.with_candle((3 * HOUR_MS, 1.0, 2.0, 0.5, 99.0, 10.0, 4 * HOUR_MS - 1))
+
+    assert len(updated) == 3
+    assert list(updated.open_time) == [HOUR_MS, 2 * HOUR_MS, 3 * HOUR_MS]
+    assert list(updated.close) == [11.0, 12.0, 99.0]
+    assert updated.open_time.dtype == klines.open_time.dtype
+
+
+def test_update_same_candle(client):
+    client._apply_kline_update(*KEY, _msg(2 * HOUR_MS, 50.0))
+
+    _, klines = client._kline_cache[KEY]
+    assert list(klines.close) == [10.0, 11.0, 50.0]
+    assert client._price_cache['AXSUSDT'][1] == 50.0
+
+
+def test_update_next_candle(client):
+    client._apply_kline_update(*KEY, _msg(3 * HOUR_MS, 50.0))
+
+    _, klines = client._kline_cache[KEY]
+    assert list(klines.open_time) == [HOUR_MS, 2 * HOUR_MS, 3 * HOUR_MS]
+    assert list(klines.close) == [11.0, 12.0, 50.0]
+
+
+def test_update_with_gap_drops_cache(client):
+    client._apply_kline_update(*KEY, _msg(5 * HOUR_MS, 50.0))
+
+    assert KEY not in client._kline_cache
+    assert client._price_cache['AXSUSDT'][1] == 50.0
+
+
+def test_update_on_stale_cache_drops_cache(client):
+    client._kline_cache[KEY] = (time.time() - KLINE_CACHE_TTL - 1, _klines())
+
+    client._apply_kline_update(*KEY, _msg(3 * HOUR_MS, 50.0))
+
+    assert KEY not in client._kline_cache
+
+
+def test_update_ignores_older_candle(client):
+    client._apply_kline_update(*KEY, _msg(0, 50.0))
+
+    _, klines = client._kline_cache[KEY]
+    assert list(klines.close) == [10.0, 11.0, 12.0]
+
+
+def test_error_frame_raises(client):
+    with pytest.raises(ConnectionError):
+        client._apply_kline_update(*KEY, {'e': 'error', 'm': 'Max reconnections reached'})